@@ -6,7 +6,10 @@ Run with: python test_requests.py
 
 import requests
 import json
+import math
 import time
+import statistics
+from contextlib import contextmanager
 from pathlib import Path
 from io import BytesIO
 from PIL import Image
@@ -15,6 +18,10 @@ from PIL import Image
 BACKEND_URL = "http://localhost:3000"
 XAI_URL = "http://127.0.0.1:5001"
 HEADERS = {"Content-Type": "application/json"}
+LOAD_ITERATIONS = 200
+LOAD_PASSWORD = "loadTestPassword123"
+LOAD_DATA_DIR = Path(__file__).resolve().parent / "backend" / "data"
+QUEST_HISTORY_SIZE = 50
 
 class Colors:
     HEADER = '\033[95m'
@@ -330,6 +337,192 @@ def test_file_validation():
         print_result(False, f"File validation test failed: {e}")
         return False
 
+@contextmanager
+def restored_backend_data():
+    """Put backend/data back as it was once a load test finishes"""
+    # The backend re-reads its JSON files on every request, so restoring them
+    # removes load users and submissions without a restart
+    if not LOAD_DATA_DIR.is_dir():
+        print(f"  {Colors.YELLOW}Note: {LOAD_DATA_DIR} not found, load test data will stay in the backend store{Colors.ENDC}")
+        yield
+        return
+    snapshot = {path: path.read_bytes() for path in LOAD_DATA_DIR.glob("*.json")}
+    try:
+        yield
+    finally:
+        for path in LOAD_DATA_DIR.glob("*.json"):
+            if path not in snapshot:
+                path.unlink()
+        for path, content in snapshot.items():
+            path.write_bytes(content)
+
+def create_load_user():
+    """Sign up a fresh user for this run and return (userId, token)"""
+    # Never reuse an account: earlier runs' submissions and XP would skew timings
+    tag = f"loadtester-{time.time_ns()}"
+    try:
+        response = requests.post(
+            f"{BACKEND_URL}/api/auth/signup",
+            json={
+                "username": tag,
+                "email": f"{tag}@example.com",
+                "password": LOAD_PASSWORD
+            },
+            headers=HEADERS,
+            timeout=10
+        )
+        data = response.json()
+        if response.status_code != 201:
+            print_result(False, f"Load test signup failed (status: {response.status_code})", data)
+            return None, None
+        return data.get('userId'), data.get('token')
+    except Exception as e:
+        print_result(False, f"Could not create load test user: {e}")
+        return None, None
+
+def percentile(samples, pct):
+    """Nearest-rank percentile (same definition as traffic_replay.py)"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(len(ordered) * pct) - 1)]
+
+def summarize_latencies(samples):
+    """Median / p95 / max of a list of latencies in milliseconds"""
+    ordered = sorted(samples)
+    return {
+        "requests": len(ordered),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(percentile(ordered, 0.95), 3),
+        "max_ms": round(ordered[-1], 3)
+    }
+
+def test_auth_verify_load():
+    """Measure auth overhead on /auth/verify and authenticated quest submission"""
+    print_test("Authenticated Load (/auth/verify + /quests/submit)")
+
+    with restored_backend_data():
+        user_id, token = create_load_user()
+        if not token:
+            print_result(False, "No token available, skipping load test")
+            return False
+
+        session = requests.Session()
+        session.headers.update({"Authorization": f"Bearer {token}", **HEADERS})
+
+        try:
+            # Alternate verify with the unauthenticated quest list on the same
+            # connection; the median difference is what the auth step costs
+            verify_samples = []
+            public_samples = []
+            for i in range(LOAD_ITERATIONS):
+                start = time.perf_counter()
+                response = session.get(f"{BACKEND_URL}/api/auth/verify", timeout=5)
+                verify_samples.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    print_result(False, f"Verify failed on iteration {i} (status: {response.status_code})")
+                    return False
+
+                start = time.perf_counter()
+                response = session.get(f"{BACKEND_URL}/api/quests", headers={"Authorization": None}, timeout=5)
+                public_samples.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    print_result(False, f"Quest list failed on iteration {i} (status: {response.status_code})")
+                    return False
+
+            # Write-heavy submits are timed separately, after all reads
+            submit_samples = []
+            for i in range(LOAD_ITERATIONS):
+                start = time.perf_counter()
+                response = session.post(
+                    f"{BACKEND_URL}/api/quests/submit",
+                    json={
+                        "userId": user_id,
+                        "questId": "lesson-waste-1",
+                        "type": "quiz",
+                        "xp": 50,
+                        "score": 85
+                    },
+                    timeout=5
+                )
+                submit_samples.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    print_result(False, f"Quest submit failed on iteration {i} (status: {response.status_code})")
+                    return False
+
+            auth_overhead_ms = statistics.median(verify_samples) - statistics.median(public_samples)
+            print_result(True, "Authenticated load completed", {
+                "user_id": user_id,
+                "auth_verify": summarize_latencies(verify_samples),
+                "unauthenticated_quests": summarize_latencies(public_samples),
+                "median_auth_overhead_us": round(auth_overhead_ms * 1000, 1),
+                "quest_submit": summarize_latencies(submit_samples)
+            })
+            return True
+        except Exception as e:
+            print_result(False, f"Authenticated load test failed: {e}")
+            return False
+        finally:
+            session.close()
+
+def test_user_quests_load():
+    """Measure GET /quests/:userId latency for a user with a fixed quest history"""
+    print_test("User Quest History Load (/quests/:userId)")
+
+    with restored_backend_data():
+        user_id, token = create_load_user()
+        if not user_id:
+            print_result(False, "No user available, skipping load test")
+            return False
+
+        session = requests.Session()
+        session.headers.update({"Authorization": f"Bearer {token}"})
+
+        try:
+            # Seed one completion per distinct quest, the same set every run
+            quests = session.get(f"{BACKEND_URL}/api/quests", timeout=5).json()[:QUEST_HISTORY_SIZE]
+            if not quests:
+                print_result(False, "No quests available to seed history")
+                return False
+            for quest in quests:
+                response = session.post(
+                    f"{BACKEND_URL}/api/quests/submit",
+                    json={
+                        "userId": user_id,
+                        "questId": quest["id"],
+                        "type": "photo",
+                        "xp": quest.get("points", 0)
+                    },
+                    headers=HEADERS,
+                    timeout=5
+                )
+                if response.status_code != 200:
+                    print_result(False, f"Seeding quest {quest['id']} failed (status: {response.status_code})")
+                    return False
+
+            samples = []
+            payload_bytes = 0
+            for i in range(LOAD_ITERATIONS):
+                start = time.perf_counter()
+                response = session.get(f"{BACKEND_URL}/api/quests/{user_id}", timeout=5)
+                samples.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    print_result(False, f"Quest history failed on iteration {i} (status: {response.status_code})")
+                    return False
+                payload_bytes = len(response.content)
+
+            print_result(True, "Quest history load completed", {
+                "user_id": user_id,
+                "distinct_quests_completed": len(quests),
+                "submissions": len(response.json().get('submissions', [])),
+                "payload_bytes": payload_bytes,
+                "quests_by_user": summarize_latencies(samples)
+            })
+            return True
+        except Exception as e:
+            print_result(False, f"Quest history load test failed: {e}")
+            return False
+        finally:
+            session.close()
+
 def main():
     """Run all tests"""
     print(f"\n{Colors.BOLD}{Colors.HEADER}")
@@ -373,6 +566,11 @@ def main():
     test_rate_limiting()
     test_file_validation()
     
+    # Load tests
+    print(f"\n{Colors.BOLD}Load Tests:{Colors.ENDC}")
+    test_auth_verify_load()
+    test_user_quests_load()
+    
     # Summary
     print(f"\n{Colors.BOLD}{Colors.GREEN}")
     print("=" * 70)
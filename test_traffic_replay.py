@@ -0,0 +1,221 @@
+"""
+GaiaQuest Traffic Replay Offline Checks
+Covers anonymization, endpoint templating, trace I/O and replay reports
+without a running backend
+Run with: python -m pytest test_traffic_replay.py
+"""
+
+import gzip
+import hashlib
+import json
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from traffic_replay import (
+    REDACTED,
+    USER_PLACEHOLDER,
+    TraceError,
+    TraceWriter,
+    anonymize_fields,
+    build_report,
+    build_request,
+    capture_body,
+    endpoint_template,
+    in_arrival_order,
+    percentile,
+    read_chunked,
+    read_trace,
+)
+
+KEY = b"k" * 32
+REPLAY_USER = {
+    "userId": "local_user",
+    "token": "local-token",
+    "email": "replay@example.com",
+    "password": "replay-pw"
+}
+
+def make_record(endpoint, method="GET", status=200, latency_ms=10.0, body=None, query=None, t=0.0):
+    return {
+        "t": t,
+        "method": method,
+        "endpoint": endpoint,
+        "query": query or {},
+        "auth": False,
+        "requestBytes": 0,
+        "body": body,
+        "status": status,
+        "responseBytes": 0,
+        "latencyMs": latency_ms
+    }
+
+def test_anonymize_fields_keeps_only_safe_values():
+    """Safe fields stay, identifiers are keyed hashes, secrets and free text are gone"""
+    payload = {
+        "email": "kid@school.org",
+        "password": "password123",
+        "userId": "u1",
+        "questId": "lesson-waste-1",
+        "xp": 50,
+        "note": "my name is Alice Smith",
+        "team": [{"userName": "EcoWarrior", "score": 85}],
+        "token": "eyJhbGciOiJIUzI1NiIs"
+    }
+    anon = anonymize_fields(payload, KEY)
+    dumped = json.dumps(anon)
+
+    assert "password" not in anon and "token" not in anon
+    assert anon["email"].endswith("@example.com") and "kid" not in anon["email"]
+    assert anon["userId"].startswith(USER_PLACEHOLDER)
+    assert anon["note"] == {REDACTED: len("my name is Alice Smith")}
+    assert anon["team"][0]["userName"] != "EcoWarrior"
+    assert anon["team"][0]["score"] == 85
+    assert anon["questId"] == "lesson-waste-1"
+    assert anon["xp"] == 50
+    for secret in ("password123", "Alice", "u1\"", "eyJhbGci"):
+        assert secret not in dumped
+    # No unsalted digest that a lookup table could reverse
+    assert hashlib.sha256(b"kid@school.org").hexdigest()[:10] not in dumped
+    # Stable within one trace, unlinkable across traces
+    assert anonymize_fields(payload, KEY) == anon
+    assert anonymize_fields(payload, b"q" * 32)["userId"] != anon["userId"]
+
+def test_capture_body_redacts_multipart_text():
+    """Free-text form fields and upload filenames never reach the trace"""
+    boundary = "XyZ"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\n"
+        "my name is Alice Smith\r\n"
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"questId\"\r\n\r\n"
+        "q-2\r\n"
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"photo\"; filename=\"alice_smith.jpg\"\r\n"
+        "Content-Type: image/jpeg\r\n\r\nnot really a jpeg\r\n"
+        f"--{boundary}--\r\n"
+    ).encode()
+    captured = capture_body(f"multipart/form-data; boundary={boundary}", body, KEY)
+
+    assert captured["fields"] == {"note": {REDACTED: 22}, "questId": "q-2"}
+    assert captured["files"]["photo"]["filename"] == "upload.jpg"
+    assert "Alice" not in json.dumps(captured) and "alice" not in json.dumps(captured)
+
+@pytest.mark.parametrize("path, expected", [
+    ("/api/quests/u1", "/api/quests/:userId"),
+    ("/api/quests/test_user_123", "/api/quests/:userId"),
+    ("/api/user/user-42/avatar", "/api/user/:userId/avatar"),
+    ("/api/xai/submission/sub-abc", "/api/xai/submission/:id"),
+    ("/api/xai/submission/1700000000000", "/api/xai/submission/:id"),
+    ("/api/quests/submit", "/api/quests/submit"),
+    ("/api/modules/waste-mgmt", "/api/modules/waste-mgmt"),
+])
+def test_endpoint_template_collapses_ids(path, expected):
+    """User and resource IDs never reach the trace in clear"""
+    assert endpoint_template(path) == expected
+
+def test_trace_round_trip():
+    """Records written by TraceWriter read back unchanged, even if truncated"""
+    records = [make_record("/api/quests/:userId", latency_ms=i) for i in range(3)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "trace.ndjson.gz"
+        writer = TraceWriter(path, "http://localhost:3000")
+        for record_ in records:
+            writer.write(record_)
+        writer.close()
+
+        header, read_back = read_trace(path)
+        assert header["target"] == "http://localhost:3000"
+        assert list(read_back) == records
+
+        # Simulate a recorder killed mid-write
+        raw = path.read_bytes()
+        path.write_bytes(raw[:-12])
+        _, read_back = read_trace(path)
+        assert list(read_back) == records
+
+def test_read_trace_rejects_empty_and_foreign_files():
+    """Empty or non-trace files raise TraceError instead of a decode crash"""
+    with tempfile.TemporaryDirectory() as tmp:
+        empty = Path(tmp) / "empty.ndjson.gz"
+        empty.write_bytes(b"")
+        with pytest.raises(TraceError):
+            read_trace(empty)
+
+        blank = Path(tmp) / "blank.ndjson.gz"
+        with gzip.open(blank, 'wt') as f:
+            f.write("")
+        with pytest.raises(TraceError):
+            read_trace(blank)
+
+        plain = Path(tmp) / "plain.txt"
+        plain.write_text("not a trace")
+        with pytest.raises(TraceError):
+            read_trace(plain)
+
+def test_build_request_substitutes_replay_user():
+    """Anonymized userIds become the replay user, redacted text becomes filler"""
+    anon = anonymize_fields({"userId": "u1", "questId": "q1", "note": "hello"}, KEY)
+    record_ = make_record(
+        "/api/quests/:userId",
+        query={"userId": anon["userId"]},
+        body={"kind": "json", "data": anon}
+    )
+    record_["auth"] = True
+    method, path, kwargs = build_request(record_, REPLAY_USER)
+
+    assert (method, path) == ("GET", "/api/quests/local_user")
+    assert kwargs["params"] == {"userId": "local_user"}
+    assert kwargs["json"] == {"userId": "local_user", "questId": "q1", "note": "xxxxx"}
+    assert kwargs["headers"]["Authorization"] == "Bearer local-token"
+
+def test_build_request_skips_unreplayable_records():
+    """Resource IDs and signups are skipped; logins use the replay user's credentials"""
+    login = make_record(
+        "/api/auth/login", method="POST",
+        body={"kind": "json", "data": anonymize_fields({"email": "a@b.c", "password": "x"}, KEY)}
+    )
+    assert build_request(make_record("/api/xai/submission/:id"), REPLAY_USER) is None
+    assert build_request(make_record("/api/auth/signup", method="POST"), REPLAY_USER) is None
+
+    _, _, kwargs = build_request(login, REPLAY_USER)
+    assert kwargs["json"] == {"email": "replay@example.com", "password": "replay-pw"}
+
+def test_read_chunked_decodes_body_and_trailers():
+    """Chunked uploads are forwarded whole and leave nothing on the socket"""
+    rfile = BytesIO(b"5\r\nhello\r\n7;ext=1\r\n, world\r\n0\r\nX-Trailer: 1\r\n\r\nGET /next")
+    assert read_chunked(rfile) == b"hello, world"
+    assert rfile.read() == b"GET /next"
+
+def test_in_arrival_order_undoes_completion_order():
+    """A slow request written after fast later arrivals is replayed at its arrival time"""
+    written = [make_record("/fast", t=1.0), make_record("/fast", t=2.0),
+               make_record("/slow", t=0.5), make_record("/fast", t=300.0)]
+    assert [r["t"] for r in in_arrival_order(written)] == [0.5, 1.0, 2.0, 300.0]
+
+def test_build_report_flags_status_mismatches():
+    """Error-path latencies are never compared with recorded successes"""
+    record_ = make_record("/api/quests/submit", method="POST", latency_ms=100.0)
+    report = build_report([(record_, 404, 5.0)], threshold=0.2)
+    row = report["endpoints"][0]
+
+    assert row["statusMismatches"] == 1
+    assert row["p95Delta"] is None
+    assert not row["regression"]
+
+def test_build_report_prefers_baseline_replay():
+    """With a baseline report, deltas ignore the recorded production latency"""
+    record_ = make_record("/api/quests/submit", method="POST", latency_ms=500.0)
+    baseline = build_report([(record_, 200, 10.0)], threshold=0.2)
+    report = build_report([(record_, 200, 15.0)], threshold=0.2, baseline=baseline)
+    row = report["endpoints"][0]
+
+    assert row["baseP95Ms"] == 10.0
+    assert row["p95Delta"] == 0.5
+    assert row["regression"]
+
+def test_percentile_nearest_rank():
+    """Same p95 definition as the load tests in test_requests.py"""
+    assert percentile(range(1, 21), 0.95) == 19
+    assert percentile(range(1, 201), 0.95) == 190
+    assert percentile([7.5], 0.95) == 7.5
@@ -0,0 +1,605 @@
+#!/usr/bin/env python3
+"""
+GaiaQuest Traffic Record & Replay
+Captures anonymized request traces in front of the backend and replays them
+against a local stack to catch latency regressions before deployment.
+
+Record (point the frontend / clients at :3100 instead of :3000):
+    python traffic_replay.py record --listen 3100 --target http://localhost:3000 --out trace.ndjson.gz
+
+Replay at 2x speed against the current build, then against the candidate build
+on the same machine and compare the two runs. Each replay signs up its own
+fresh user and sends every recorded user's requests as that user, so both runs
+start from the same empty per-user history:
+    python traffic_replay.py replay trace.ndjson.gz --speed 2 --report old.json
+    python traffic_replay.py replay trace.ndjson.gz --speed 2 --baseline old.json
+
+Without --baseline the replay is compared with the latencies seen at capture
+time, which also includes any hardware / environment difference.
+
+Trace format: gzip-compressed newline-delimited JSON, one request per line,
+written when each response completes. Request bodies are never stored
+verbatim: only SAFE_FIELDS are kept as-is, user identifiers are replaced with
+HMACs under a random per-trace key that is never written out, passwords and
+tokens are dropped, every other string is reduced to its length, auth headers
+are dropped, and photos are reduced to a SHA-256 plus a small JPEG thumbnail
+that is scaled back up on replay.
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import heapq
+import hmac
+import json
+import math
+import re
+import secrets
+import signal
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import PurePath
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+
+# Configuration
+BACKEND_URL = "http://localhost:3000"
+TRACE_VERSION = 1
+THUMBNAIL_SIZE = (64, 64)
+SAFE_FIELDS = {"questId", "lessonId", "moduleId", "questTitle", "type", "xp", "xpAwarded", "score", "points", "tags"}
+PSEUDONYM_FIELDS = {"userId", "email", "to", "username", "userName"}
+DROPPED_FIELDS = {"password", "token", "passwordHash"}
+USER_FIELDS = {"userId"}
+REDACTED = "$redacted"
+USER_PLACEHOLDER = "anon-user-"
+USER_SEGMENT = re.compile(r'^(u\d+|(\w+[-_])?user[-_][\w-]+)$', re.IGNORECASE)
+ID_SEGMENT = re.compile(r'^(sub-[\w-]+|[0-9a-f-]{16,}|\d+)$', re.IGNORECASE)
+CREDENTIAL_ENDPOINTS = {"POST /api/auth/login", "POST /api/auth/signup"}
+HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-length", "content-encoding"}
+REGRESSION_THRESHOLD = 0.20
+PROXY_POOL_SIZE = 64
+UPSTREAM_TIMEOUT = 60
+# Records are written on completion, so one can trail later arrivals by at most
+# its upstream latency; twice the timeout leaves room for slow reads
+REORDER_WINDOW = 2 * UPSTREAM_TIMEOUT
+
+# ANSI colors
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+CYAN = '\033[96m'
+RESET = '\033[0m'
+BOLD = '\033[1m'
+
+
+# ---------------------------------------------------------------------------
+# Anonymization
+# ---------------------------------------------------------------------------
+
+def pseudonymize(field, value, key):
+    """Keyed hash: groups one value within a trace but cannot be looked up"""
+    digest = hmac.new(key, str(value).encode('utf-8'), hashlib.sha256).hexdigest()[:16]
+    if field in ("email", "to"):
+        return f"anon-{digest}@example.com"
+    if field in USER_FIELDS:
+        return f"{USER_PLACEHOLDER}{digest}"
+    return f"anon-{digest}"
+
+def anonymize_fields(data, key, field=None):
+    """Keep SAFE_FIELDS, pseudonymize identifiers, drop secrets, reduce other strings to their length"""
+    if isinstance(data, dict):
+        return {
+            name: anonymize_fields(value, key, name)
+            for name, value in data.items()
+            if name not in DROPPED_FIELDS
+        }
+    if isinstance(data, list):
+        return [anonymize_fields(item, key, field) for item in data]
+    if data is None or field in SAFE_FIELDS:
+        return data
+    if field in PSEUDONYM_FIELDS:
+        return pseudonymize(field, data, key)
+    if isinstance(data, str):
+        return {REDACTED: len(data)}
+    return data
+
+def endpoint_template(path):
+    """Collapse ID-like path segments, e.g. /api/quests/u1 -> /api/quests/:userId"""
+    def collapse(seg):
+        if USER_SEGMENT.match(seg):
+            return ":userId"
+        if ID_SEGMENT.match(seg):
+            return ":id"
+        return seg
+    return "/".join(collapse(seg) for seg in path.split("/"))
+
+def summarize_image(raw):
+    """SHA-256, original size and a small JPEG thumbnail of an uploaded photo"""
+    summary = {"sha256": hashlib.sha256(raw).hexdigest(), "bytes": len(raw)}
+    try:
+        img = Image.open(BytesIO(raw))
+        summary["width"], summary["height"] = img.size
+        img = img.convert('RGB')
+        img.thumbnail(THUMBNAIL_SIZE)
+        buf = BytesIO()
+        img.save(buf, format='JPEG', quality=70)
+        summary["thumbnail"] = base64.b64encode(buf.getvalue()).decode('ascii')
+    except Exception:
+        # Not a decodable image (e.g. a rejected upload); keep hash and size only
+        pass
+    return summary
+
+def capture_body(content_type, body, key):
+    """Turn a raw request body into an anonymized, replayable description"""
+    if not body:
+        return None
+    if content_type.startswith("application/json"):
+        try:
+            return {"kind": "json", "data": anonymize_fields(json.loads(body), key)}
+        except ValueError:
+            return {"kind": "raw", "bytes": len(body)}
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode('latin-1') + body
+        )
+        fields, files = {}, {}
+        for part in message.iter_parts():
+            name = part.get_param('name', header='content-disposition')
+            payload = part.get_payload(decode=True) or b""
+            if part.get_filename():
+                files[name] = {
+                    "filename": "upload" + PurePath(part.get_filename()).suffix[:8],
+                    "contentType": part.get_content_type(),
+                    **summarize_image(payload)
+                }
+            else:
+                fields[name] = payload.decode('utf-8', errors='replace')
+        return {"kind": "multipart", "fields": anonymize_fields(fields, key), "files": files}
+    return {"kind": "raw", "bytes": len(body)}
+
+
+# ---------------------------------------------------------------------------
+# Trace I/O
+# ---------------------------------------------------------------------------
+
+class ReplayError(Exception):
+    """Raised when a replay cannot start"""
+
+class TraceError(ReplayError, ValueError):
+    """Raised when a file is not a readable trace"""
+
+class TraceWriter:
+    """Thread-safe, line-buffered writer for gzip NDJSON traces"""
+
+    def __init__(self, path, target):
+        # Pseudonymization key for this trace only; never written to disk
+        self.key = secrets.token_bytes(32)
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self.count = 0
+        self._write({"trace": TRACE_VERSION, "target": target, "startedAt": time.time()})
+
+    def elapsed(self):
+        return time.monotonic() - self._start
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(',', ':')) + "\n")
+
+    def write(self, record):
+        with self._lock:
+            self._write(record)
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+def read_trace(path):
+    """Yield (header, records) from a trace file without loading it all at once"""
+    handle = gzip.open(path, 'rt', encoding='utf-8')
+    try:
+        first = handle.readline()
+        header = json.loads(first) if first.strip() else None
+    except (OSError, EOFError, ValueError):
+        header = None
+    if not isinstance(header, dict):
+        handle.close()
+        raise TraceError(f"{path} is empty or not a trace file")
+    if header.get("trace") != TRACE_VERSION:
+        handle.close()
+        raise TraceError(f"Unsupported trace version: {header.get('trace')}")
+
+    def records():
+        with handle:
+            try:
+                for line in handle:
+                    if line.strip():
+                        yield json.loads(line)
+            except (EOFError, ValueError):
+                # Recorder was killed mid-write; keep everything before the cut
+                return
+
+    return header, records()
+
+def in_arrival_order(records, window=REORDER_WINDOW):
+    """Re-sort completion-ordered records by arrival time without loading the whole trace"""
+    pending = []
+    for seq, record_ in enumerate(records):
+        heapq.heappush(pending, (record_["t"], seq, record_))
+        while pending[0][0] < record_["t"] - window:
+            yield heapq.heappop(pending)[2]
+    while pending:
+        yield heapq.heappop(pending)[2]
+
+
+# ---------------------------------------------------------------------------
+# Recording proxy
+# ---------------------------------------------------------------------------
+
+def make_session(pool_size):
+    """Session whose connection pool holds one keep-alive connection per concurrent caller"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def read_chunked(rfile):
+    """Decode a Transfer-Encoding: chunked request body"""
+    chunks = []
+    while True:
+        size = int(rfile.readline(65537).split(b";", 1)[0].strip(), 16)
+        if size == 0:
+            break
+        chunks.append(rfile.read(size))
+        rfile.readline()
+    # Skip any trailer headers up to the terminating blank line
+    while rfile.readline(65537) not in (b"\r\n", b"\n", b""):
+        pass
+    return b"".join(chunks)
+
+def make_recording_handler(target, writer):
+    session = make_session(PROXY_POOL_SIZE)
+
+    class RecordingHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; with Nagle on, the body
+        # waits for the client's delayed ACK (~40 ms on keep-alive connections)
+        disable_nagle_algorithm = True
+
+        def _read_body(self):
+            encoding = self.headers.get('Transfer-Encoding', '').lower()
+            if encoding == 'chunked':
+                return read_chunked(self.rfile)
+            if encoding:
+                raise ValueError(f"Unsupported Transfer-Encoding: {encoding}")
+            length = int(self.headers.get('Content-Length') or 0)
+            return self.rfile.read(length) if length else b""
+
+        def _proxy(self):
+            offset = writer.elapsed()
+            try:
+                body = self._read_body()
+            except ValueError as e:
+                # The rest of the body is still on the socket; never reuse it
+                self.close_connection = True
+                self.send_error(400, str(e))
+                return
+            content_type = self.headers.get('Content-Type', '')
+            headers = {k: v for k, v in self.headers.items()
+                       if k.lower() not in HOP_BY_HOP_HEADERS and k.lower() != 'host'}
+
+            start = time.perf_counter()
+            try:
+                upstream = session.request(self.command, target + self.path, headers=headers,
+                                           data=body or None, timeout=UPSTREAM_TIMEOUT, allow_redirects=False)
+                status, content = upstream.status_code, upstream.content
+                response_headers = upstream.headers
+            except requests.RequestException as e:
+                status, content, response_headers = 502, str(e).encode('utf-8'), {}
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            self.send_response(status)
+            for key, value in response_headers.items():
+                if key.lower() not in HOP_BY_HOP_HEADERS:
+                    self.send_header(key, value)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+            url = urlsplit(self.path)
+            writer.write({
+                "t": round(offset, 4),
+                "method": self.command,
+                "endpoint": endpoint_template(url.path),
+                "query": anonymize_fields(dict(parse_qsl(url.query)), writer.key),
+                "auth": 'Authorization' in self.headers,
+                "requestBytes": len(body),
+                "body": capture_body(content_type, body, writer.key),
+                "status": status,
+                "responseBytes": len(content),
+                "latencyMs": round(latency_ms, 3)
+            })
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _proxy
+
+        def log_message(self, format, *args):
+            pass
+
+    return RecordingHandler
+
+def stop_recording(signum, frame):
+    raise KeyboardInterrupt
+
+def record(args):
+    signal.signal(signal.SIGTERM, stop_recording)
+    writer = TraceWriter(args.out, args.target)
+    server = ThreadingHTTPServer(("0.0.0.0", args.listen), make_recording_handler(args.target, writer))
+    print(f"{BOLD}{CYAN}Recording{RESET} :{args.listen} -> {args.target} into {args.out} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        writer.close()
+        print(f"\n{GREEN}✓ Captured {writer.count} requests{RESET}")
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+def restore_fields(data, user_id):
+    """Refill anonymized fields: userId placeholders -> replay user, redacted strings -> filler"""
+    if isinstance(data, dict):
+        if set(data) == {REDACTED}:
+            return "x" * data[REDACTED]
+        return {key: restore_fields(value, user_id) for key, value in data.items()}
+    if isinstance(data, list):
+        return [restore_fields(item, user_id) for item in data]
+    if isinstance(data, str) and data.startswith(USER_PLACEHOLDER):
+        return user_id
+    return data
+
+def build_request(record_, user):
+    """Rebuild requests.request() kwargs from an anonymized trace record
+
+    `user` is the replay user from create_replay_user(). Returns None for
+    records that cannot hit the same code path on replay: non-user IDs
+    (submissions etc.) that do not exist on the local stack, and signups.
+    """
+    key = f"{record_['method']} {record_['endpoint']}"
+    if ":id" in record_["endpoint"].split("/"):
+        return None
+    if key in CREDENTIAL_ENDPOINTS and key != "POST /api/auth/login":
+        return None
+
+    user_id = user["userId"]
+    path = record_["endpoint"].replace(":userId", user_id)
+    kwargs = {"params": restore_fields(record_.get("query"), user_id) or None, "headers": {}}
+    if record_.get("auth"):
+        kwargs["headers"]["Authorization"] = f"Bearer {user['token']}"
+
+    body = record_.get("body")
+    if key == "POST /api/auth/login":
+        kwargs["json"] = {"email": user["email"], "password": user["password"]}
+    elif body and body["kind"] == "json":
+        kwargs["json"] = restore_fields(body["data"], user_id)
+    elif body and body["kind"] == "multipart":
+        kwargs["data"] = restore_fields(body["fields"], user_id)
+        kwargs["files"] = {
+            name: (meta["filename"], rebuild_image(meta), meta["contentType"])
+            for name, meta in body["files"].items()
+        }
+    elif body:
+        kwargs["data"] = b"\0" * body["bytes"]
+    return record_["method"], path, kwargs
+
+def rebuild_image(meta):
+    """Upscale the stored thumbnail back to the original photo dimensions"""
+    if "thumbnail" not in meta:
+        return b"\0" * meta["bytes"]
+    img = Image.open(BytesIO(base64.b64decode(meta["thumbnail"])))
+    img = img.resize((meta["width"], meta["height"]))
+    buf = BytesIO()
+    img.save(buf, format='JPEG', quality=90)
+    return buf.getvalue()
+
+def percentile(samples, pct):
+    """Nearest-rank percentile (same definition as the load tests in test_requests.py)"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(len(ordered) * pct) - 1)]
+
+def create_replay_user(session, target):
+    """Sign up a fresh user so every replay starts from the same empty history"""
+    tag = f"replay-{time.time_ns()}"
+    user = {"username": tag, "email": f"{tag}@example.com", "password": secrets.token_urlsafe(12)}
+    try:
+        response = session.post(f"{target}/api/auth/signup", json=user, timeout=10)
+        data = response.json()
+    except (requests.RequestException, ValueError) as e:
+        raise ReplayError(f"Could not sign up replay user: {e}")
+    if response.status_code != 201 or not data.get('token'):
+        raise ReplayError(f"Could not sign up replay user (status: {response.status_code})")
+    return {**user, "userId": data["userId"], "token": data["token"]}
+
+def replay(args):
+    header, records = read_trace(args.trace)
+    # The default pool keeps 10 connections; any worker beyond that would
+    # reconnect per request and add connect time to the measured latency
+    session = make_session(args.workers)
+    user = create_replay_user(session, args.target)
+    results = []
+    skipped = {}
+    results_lock = threading.Lock()
+
+    def send(record_, scheduled, method, path, kwargs):
+        try:
+            status = session.request(method, args.target + path, timeout=args.timeout, **kwargs).status_code
+        except requests.RequestException:
+            status = None
+        # Timed from the scheduled send, so time spent queued behind busy
+        # workers counts against the build under test
+        latency_ms = (time.perf_counter() - scheduled) * 1000
+        with results_lock:
+            results.append((record_, status, latency_ms))
+
+    print(f"{BOLD}{CYAN}Replaying{RESET} {args.trace} (recorded against {header['target']}) "
+          f"-> {args.target} at {args.speed}x as {user['username']}")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for record_ in in_arrival_order(records):
+            request = build_request(record_, user)
+            if request is None:
+                key = f"{record_['method']} {record_['endpoint']}"
+                skipped[key] = skipped.get(key, 0) + 1
+                continue
+            scheduled = start + record_["t"] / args.speed
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, record_, scheduled, *request)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    report = build_report(results, args.threshold, baseline)
+    report["baseline"] = args.baseline or "recorded"
+    report["skipped"] = skipped
+    print_report(report, args.threshold)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 1 if any(row["regression"] or row["statusMismatches"] for row in report["endpoints"]) else 0
+
+def baseline_latencies(baseline):
+    """Endpoint -> (p50, p95) from an earlier replay report, minus unreliable rows"""
+    return {
+        row["endpoint"]: (row["replayedP50Ms"], row["replayedP95Ms"])
+        for row in baseline["endpoints"]
+        if not row["statusMismatches"]
+    }
+
+def build_report(results, threshold, baseline=None):
+    """Per-endpoint replay latency compared with a baseline replay or the trace"""
+    previous = baseline_latencies(baseline) if baseline else None
+    grouped = {}
+    for record_, status, latency_ms in results:
+        key = f"{record_['method']} {record_['endpoint']}"
+        row = grouped.setdefault(key, {"recorded": [], "replayed": [], "errors": 0})
+        row["recorded"].append(record_["latencyMs"])
+        row["replayed"].append(latency_ms)
+        if status is None or status != record_["status"]:
+            row["errors"] += 1
+
+    endpoints = []
+    for key, row in sorted(grouped.items()):
+        recorded_p50 = statistics.median(row["recorded"])
+        replayed_p50 = statistics.median(row["replayed"])
+        recorded_p95 = percentile(row["recorded"], 0.95)
+        replayed_p95 = percentile(row["replayed"], 0.95)
+        if previous is None:
+            base_p50, base_p95 = recorded_p50, recorded_p95
+        else:
+            base_p50, base_p95 = previous.get(key, (None, None))
+        # A mismatched status means replay took a different (usually error) path,
+        # so its latency says nothing about the baseline one
+        if row["errors"] or not base_p95:
+            delta = None
+        else:
+            delta = (replayed_p95 - base_p95) / base_p95
+        endpoints.append({
+            "endpoint": key,
+            "requests": len(row["recorded"]),
+            "statusMismatches": row["errors"],
+            "recordedP50Ms": round(recorded_p50, 3),
+            "replayedP50Ms": round(replayed_p50, 3),
+            "recordedP95Ms": round(recorded_p95, 3),
+            "replayedP95Ms": round(replayed_p95, 3),
+            "baseP50Ms": None if base_p50 is None else round(base_p50, 3),
+            "baseP95Ms": None if base_p95 is None else round(base_p95, 3),
+            "p95Delta": None if delta is None else round(delta, 4),
+            "regression": delta is not None and delta > threshold
+        })
+    return {"requests": len(results), "endpoints": endpoints}
+
+def print_report(report, threshold):
+    print(f"\n{BOLD}Baseline: {report['baseline']}{RESET}")
+    print(f"{BOLD}{'Endpoint':<40}{'n':>6}{'base p50':>10}{'new p50':>10}"
+          f"{'base p95':>10}{'new p95':>10}{'Δ p95':>9}{RESET}")
+    for row in report["endpoints"]:
+        if row["p95Delta"] is None:
+            delta = f"{RED if row['statusMismatches'] else YELLOW}{'n/a':>9}{RESET}"
+        else:
+            delta = f"{RED if row['regression'] else GREEN}{row['p95Delta']:>+9.0%}{RESET}"
+        base_p50 = "-" if row["baseP50Ms"] is None else f"{row['baseP50Ms']:.1f}"
+        base_p95 = "-" if row["baseP95Ms"] is None else f"{row['baseP95Ms']:.1f}"
+        print(f"{row['endpoint']:<40}{row['requests']:>6}"
+              f"{base_p50:>10}{row['replayedP50Ms']:>10.1f}"
+              f"{base_p95:>10}{row['replayedP95Ms']:>10.1f}{delta}")
+        if row["statusMismatches"]:
+            print(f"  {RED}{row['statusMismatches']} responses differed from recorded status{RESET}")
+        elif row["baseP95Ms"] is None:
+            print(f"  {YELLOW}no usable baseline for this endpoint{RESET}")
+    for endpoint, count in sorted(report.get("skipped", {}).items()):
+        print(f"{YELLOW}  skipped {count} x {endpoint} (not replayable against this stack){RESET}")
+
+    regressions = [row["endpoint"] for row in report["endpoints"] if row["regression"]]
+    mismatches = [row["endpoint"] for row in report["endpoints"] if row["statusMismatches"]]
+    if mismatches:
+        print(f"\n{RED}✗ Status differed from the trace on: {', '.join(mismatches)}{RESET}")
+    if regressions:
+        print(f"\n{RED}✗ p95 regressed more than {threshold:.0%} on: {', '.join(regressions)}{RESET}")
+    if not mismatches and not regressions:
+        print(f"\n{GREEN}✓ No endpoint regressed more than {threshold:.0%}{RESET}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay GaiaQuest API traffic")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rec = commands.add_parser("record", help="Run a recording proxy in front of the backend")
+    rec.add_argument("--listen", type=int, default=3100, help="Port the proxy listens on")
+    rec.add_argument("--target", default=BACKEND_URL, help="Backend to forward requests to")
+    rec.add_argument("--out", default="trace.ndjson.gz", help="Trace file to write")
+
+    rep = commands.add_parser("replay", help="Replay a trace and compare latencies")
+    rep.add_argument("trace", help="Trace file written by 'record'")
+    rep.add_argument("--target", default=BACKEND_URL, help="Backend to replay against")
+    rep.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier (>= 1)")
+    rep.add_argument("--workers", type=int, default=16, help="Max concurrent in-flight requests")
+    rep.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    rep.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                     help="Fail when an endpoint's p95 grows by more than this fraction")
+    rep.add_argument("--report", help="Also write the comparison report as JSON")
+    rep.add_argument("--baseline", help="Report JSON from an earlier replay of the same trace to compare against")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args)
+        return 0
+    if args.speed < 1:
+        parser.error("--speed must be >= 1")
+    try:
+        return replay(args)
+    except ReplayError as e:
+        print(f"{RED}✗ {e}{RESET}")
+        return 2
+
+if __name__ == '__main__':
+    sys.exit(main())